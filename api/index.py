@@ -4,6 +4,13 @@ import os
 # Add the parent directory to Python path to import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Use uvloop for the event loop when available (not supported on Windows)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 from main import app
 
 # Vercel requires the app to be exported
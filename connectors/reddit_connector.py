@@ -3,90 +3,375 @@ Reddit API connector for SecureAsk
 """
 
 import asyncio
+import hashlib
+from itertools import chain
 import logging
 import os
-from typing import List, Dict, Any, Optional
+import time
+from types import MappingProxyType
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import aiohttp
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
 import json
+import orjson
 from datetime import datetime
+
+from connectors.utils import release_session, ts_iso
 import base64
 
 logger = logging.getLogger(__name__)
 
+# Read-only fallback posts used when every Reddit source fails; {query} and {slug} are filled per call
+_MOCK_POSTS = (
+    MappingProxyType({
+        "title": "Discussion: {query} latest developments",
+        "content": "Retail investors are actively discussing {query}. Key points include: regulatory compliance costs, supply chain transparency requirements, and investor expectations for ESG reporting. Some users highlight potential competitive advantages from early adoption of sustainable practices.",
+        "url": "https://reddit.com/r/investing/posts/12345-{slug}",
+        "subreddit": "investing",
+        "score": 147,
+        "num_comments": 42
+    }),
+    MappingProxyType({
+        "title": "{query} ESG analysis - worth the investment?",
+        "content": "Mixed opinions on {query} ESG initiatives. Bulls argue that sustainability investments drive long-term value and reduce regulatory risk. Bears worry about near-term costs and implementation challenges. Most agree that transparent reporting is crucial for investor confidence.",
+        "url": "https://reddit.com/r/SecurityAnalysis/posts/67890-{slug}-esg",
+        "subreddit": "SecurityAnalysis",
+        "score": 89,
+        "num_comments": 28
+    }),
+    MappingProxyType({
+        "title": "Risk assessment: {query} climate exposure",
+        "content": "Analysis of {query} climate-related risks and opportunities. Physical risks include supply chain disruption from extreme weather. Transition risks include carbon pricing and changing consumer preferences. Opportunities include market leadership in clean technology.",
+        "url": "https://reddit.com/r/stocks/posts/24680-{slug}-climate",
+        "subreddit": "stocks",
+        "score": 203,
+        "num_comments": 67
+    }),
+    MappingProxyType({
+        "title": "Institutional perspective on {query} sustainability",
+        "content": "Large institutional investors are increasingly focused on {query} ESG metrics. BlackRock and Vanguard have raised questions about long-term sustainability strategies. Proxy voting trends show growing support for climate-related shareholder proposals.",
+        "url": "https://reddit.com/r/ValueInvesting/posts/13579-{slug}-institutional",
+        "subreddit": "ValueInvesting",
+        "score": 156,
+        "num_comments": 38
+    }),
+    MappingProxyType({
+        "title": "{query} quarterly earnings call - ESG highlights",
+        "content": "Recent earnings call included significant discussion of {query} ESG initiatives and climate commitments. Management emphasized progress on renewable energy goals and supply chain sustainability. Analysts asked pointed questions about carbon accounting and disclosure standards.",
+        "url": "https://reddit.com/r/financialindependence/posts/97531-{slug}-earnings",
+        "subreddit": "financialindependence",
+        "score": 94,
+        "num_comments": 23
+    })
+)
+
 class RedditConnector:
     """Connector for Reddit API using pushshift.io and reddit.com search"""
     
     _access_token: Optional[str] = None
-    _token_expires: float = 0
+    _token_expires: float = 0  # time.monotonic() deadline
+    _basic_auth_header: Optional[str] = None
+    DEFAULT_SUBREDDITS = ["investing", "stocks", "SecurityAnalysis", "ValueInvesting", "financialindependence"]
+    
+    # Session, locks, limiters and in-flight tasks all belong to one event loop; _bind_loop recreates them per loop
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _session: Optional[aiohttp.ClientSession] = None
+    _token_lock: Optional[asyncio.Lock] = None
+    _inflight: Dict[str, asyncio.Task] = {}
+    
+    # Recent results, per search and per subreddit, to skip repeat round trips to Reddit
+    CACHE_TTL = int(os.getenv('REDDIT_CACHE_TTL', '600'))
+    _results_cache = TTLCache(maxsize=512, ttl=CACHE_TTL)
+    _subreddit_cache = TTLCache(maxsize=512, ttl=CACHE_TTL)
+    _cache_stats = {"hits": 0, "misses": 0}
+    
+    # Reddit's public JSON API allows ~60 requests/minute; pushshift is stricter
+    REDDIT_REQUESTS_PER_MINUTE = 60
+    PUSHSHIFT_REQUESTS_PER_MINUTE = 30
+    _reddit_limiter: Optional[AsyncLimiter] = None
+    _pushshift_limiter: Optional[AsyncLimiter] = None
+    
+    # Caps on simultaneous upstream requests, tunable per deployment
+    MAX_CONCURRENCY = int(os.getenv('REDDIT_MAX_CONCURRENCY', '6'))
+    LIMIT_PER_HOST = int(os.getenv('REDDIT_LIMIT_PER_HOST', '6'))
+    _semaphore: Optional[asyncio.Semaphore] = None
+    
+    POSTS_PER_SUBREDDIT = 3
+    MAX_RESULTS = 10
+    
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    MAX_RETRIES = 3
+    RETRY_DELAY = 0.5
+    
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """Hit/miss counts for the in-process search results cache"""
+        return {**cls._cache_stats, "size": len(cls._results_cache)}
+    
+    @classmethod
+    async def _bind_loop(cls):
+        """Recreate the loop-bound state when called from a new event loop (e.g. a later asyncio.run)"""
+        loop = asyncio.get_running_loop()
+        if cls._loop is loop:
+            return
+        # Swap everything in before awaiting, so concurrent callers on the new loop see it already bound
+        stale_session, stale_loop = cls._session, cls._loop
+        cls._loop = loop
+        cls._session = None
+        cls._token_lock = asyncio.Lock()
+        cls._semaphore = asyncio.Semaphore(cls.MAX_CONCURRENCY)
+        cls._reddit_limiter = AsyncLimiter(cls.REDDIT_REQUESTS_PER_MINUTE, 60)
+        cls._pushshift_limiter = AsyncLimiter(cls.PUSHSHIFT_REQUESTS_PER_MINUTE, 60)
+        cls._inflight = {}
+        await release_session(stale_session, stale_loop)
+    
+    @classmethod
+    async def _get_session(cls) -> aiohttp.ClientSession:
+        """Get the shared HTTP session for the running loop, creating it on first use"""
+        await cls._bind_loop()
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=20,
+                    limit_per_host=cls.LIMIT_PER_HOST,
+                    use_dns_cache=True,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30,
+                    enable_cleanup_closed=True  # Reap sockets Reddit resets mid-keepalive
+                ),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={'User-Agent': 'SecureAsk/1.0 (hackathon demo)'}
+            )
+        return cls._session
+    
+    @classmethod
+    async def close(cls):
+        """Close the shared HTTP session"""
+        if cls._session and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+    
+    @classmethod
+    async def warm_up(cls):
+        """Resolve DNS and open a pooled TLS connection to Reddit ahead of the first query"""
+        try:
+            session = await cls._get_session()
+            async with session.head("https://www.reddit.com/", allow_redirects=False, timeout=aiohttp.ClientTimeout(total=3)):
+                pass
+        except Exception as e:
+            logger.warning(f"Reddit connection warm-up failed: {e}")
+    
+    @classmethod
+    async def _get_json(
+        cls,
+        session: aiohttp.ClientSession,
+        limiter: AsyncLimiter,
+        url: str,
+        **kwargs
+    ) -> Tuple[int, Optional[Any]]:
+        """GET a JSON endpoint under a rate limiter, retrying throttled and 5xx responses"""
+        for attempt in range(cls.MAX_RETRIES):
+            async with cls._semaphore, limiter:
+                async with session.get(url, **kwargs) as response:
+                    if response.status == 200:
+                        return response.status, orjson.loads(await response.read())
+                    status = response.status
+            
+            if status not in cls.RETRY_STATUSES or attempt == cls.MAX_RETRIES - 1:
+                return status, None
+            
+            await asyncio.sleep(cls.RETRY_DELAY * (2 ** attempt))
+            logger.warning(f"Retrying {url} after {status} ({attempt + 1}/{cls.MAX_RETRIES})")
+    
+    @classmethod
+    def _auth_header(cls) -> Optional[str]:
+        """Build the Basic auth header for the OAuth app once and reuse it"""
+        if cls._basic_auth_header is None:
+            client_id = os.getenv('REDDIT_CLIENT_ID')
+            client_secret = os.getenv('REDDIT_CLIENT_SECRET')
+            
+            if not client_id or not client_secret or client_id == 'your-client-id':
+                return None
+            
+            auth_str = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+            cls._basic_auth_header = f'Basic {auth_str}'
+        return cls._basic_auth_header
     
     @classmethod
     async def _get_reddit_token(cls) -> Optional[str]:
         """Get Reddit OAuth2 access token"""
-        client_id = os.getenv('REDDIT_CLIENT_ID')
-        client_secret = os.getenv('REDDIT_CLIENT_SECRET')
-        
-        if not client_id or not client_secret or client_id == 'your-client-id':
+        auth_header = cls._auth_header()
+        if auth_header is None:
             return None
             
         # Check if we have a valid cached token
-        if cls._access_token and cls._token_expires > datetime.now().timestamp():
+        if cls._access_token and cls._token_expires > time.monotonic():
             return cls._access_token
+        
+        await cls._bind_loop()
+        async with cls._token_lock:
+            # Another coroutine may have refreshed while we waited
+            if cls._access_token and cls._token_expires > time.monotonic():
+                return cls._access_token
             
-        try:
-            # Get new token
-            auth_str = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
-            headers = {
-                'Authorization': f'Basic {auth_str}',
-                'User-Agent': os.getenv('REDDIT_USER_AGENT', 'SecureAsk/1.0')
-            }
-            
-            async with aiohttp.ClientSession() as session:
+            try:
+                # Get new token
+                headers = {
+                    'Authorization': auth_header,
+                    'User-Agent': os.getenv('REDDIT_USER_AGENT', 'SecureAsk/1.0')
+                }
+                
+                session = await cls._get_session()
                 async with session.post(
                     'https://www.reddit.com/api/v1/access_token',
                     data={'grant_type': 'client_credentials'},
                     headers=headers
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = orjson.loads(await response.read())
                         cls._access_token = data['access_token']
-                        cls._token_expires = datetime.now().timestamp() + data.get('expires_in', 3600) - 60
+                        cls._token_expires = time.monotonic() + data.get('expires_in', 3600) - 60
                         logger.info("Successfully obtained Reddit OAuth token")
                         return cls._access_token
                     else:
                         logger.error(f"Failed to get Reddit token: {response.status}")
                         return None
-                        
-        except Exception as e:
-            logger.error(f"Error getting Reddit token: {e}")
-            return None
+                            
+            except Exception as e:
+                logger.error(f"Error getting Reddit token: {e}")
+                return None
     
     @staticmethod
-    async def search_posts(query: str, subreddits: List[str] = None) -> List[Dict[str, Any]]:
+    def _query_key(query: str, subreddits: Optional[List[str]]) -> str:
+        """Key a search by its normalized query and subreddit list"""
+        return hashlib.blake2b(
+            f"{query.strip().lower()}|{','.join(subreddits or [])}".encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+    
+    @classmethod
+    async def search_posts(cls, query: str, subreddits: List[str] = None) -> List[Dict[str, Any]]:
+        """Search Reddit posts, sharing one upstream fetch between concurrent identical queries"""
+        key = cls._query_key(query, subreddits)
+        cached = cls._results_cache.get(key)
+        if cached is not None:
+            cls._cache_stats["hits"] += 1
+            return cached
+        cls._cache_stats["misses"] += 1
+        
+        await cls._bind_loop()
+        task = cls._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(cls._search_posts(query, subreddits))
+            cls._inflight[key] = task
+            task.add_done_callback(lambda _: cls._inflight.pop(key, None))
+        
+        return await asyncio.shield(task)
+    
+    @classmethod
+    async def iter_posts(cls, query: str, subreddits: List[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield unique Reddit posts as soon as each subreddit search returns, with search_posts' cache, cap and fallbacks"""
+        key = cls._query_key(query, subreddits)
+        cached = cls._results_cache.get(key)
+        if cached is not None:
+            cls._cache_stats["hits"] += 1
+            for post in cached:
+                yield post
+            return
+        
+        await cls._bind_loop()
+        if key in cls._inflight or await cls._get_reddit_token():
+            # An identical search is already running, or OAuth answers in one request; either way there is nothing to stream
+            for post in await cls.search_posts(query, subreddits):
+                yield post
+            return
+        cls._cache_stats["misses"] += 1
+        
+        subreddits = subreddits or cls.DEFAULT_SUBREDDITS
+        seen_urls = set()
+        pushshift_task = None
+        searches = {}
+        try:
+            logger.info(f"Streaming Reddit search for: {query}")
+            session = await cls._get_session()
+            
+            pushshift_task = asyncio.ensure_future(cls._search_pushshift(session, query, subreddits))
+            searches = {
+                asyncio.ensure_future(cls._search_subreddit_json(session, query, subreddit)): index
+                for index, subreddit in enumerate(subreddits[:3])  # Limit to avoid rate limits
+            }
+            # Kept in subreddit order so the cached list matches what search_posts would have stored
+            batches = [[] for _ in searches]
+            pending = set(searches)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    batch = batches[searches[task]] = task.result()
+                    for post in cls._new_posts(batch, seen_urls):
+                        yield post
+            
+            if sum(len(batch) for batch in batches) < 5:
+                batches.append(await pushshift_task)
+                for post in cls._new_posts(batches[-1], seen_urls):
+                    yield post
+            
+            unique_results = cls._unique_posts(batches)
+            if unique_results:
+                cls._results_cache[key] = unique_results
+            
+        except Exception as e:
+            logger.error(f"Reddit API error: {e}")
+        finally:
+            # Stop upstream requests the consumer no longer wants (early exit or client disconnect)
+            for task in chain(searches, [pushshift_task] if pushshift_task else []):
+                task.cancel()
+        
+        if not seen_urls:
+            for post in cls._mock_posts(query):
+                yield post
+    
+    @classmethod
+    async def search_posts_stream(cls, query: str, subreddits: List[str] = None) -> AsyncIterator[bytes]:
+        """Yield Reddit posts as NDJSON lines as soon as each subreddit search returns"""
+        async for post in cls.iter_posts(query, subreddits):
+            yield orjson.dumps(post) + b"\n"
+    
+    @classmethod
+    async def _search_posts(cls, query: str, subreddits: List[str] = None) -> List[Dict[str, Any]]:
         """Search Reddit posts for financial discussions using multiple methods"""
+        key = cls._query_key(query, subreddits)
         try:
             logger.info(f"Searching Reddit for: {query}")
             
-            subreddits = subreddits or ["investing", "stocks", "SecurityAnalysis", "ValueInvesting", "financialindependence"]
+            subreddits = subreddits or cls.DEFAULT_SUBREDDITS
+            
+            session = await cls._get_session()
             
-            results = []
+            # Method 1: One OAuth search across all subreddits when credentials are configured
+            batches = []
+            token = await cls._get_reddit_token()
+            if token:
+                batches.append(await cls._search_oauth(session, token, query, subreddits))
             
-            # Method 1: Use Reddit JSON API (no auth required)
-            for subreddit in subreddits[:3]:  # Limit to avoid rate limits
-                subreddit_results = await RedditConnector._search_subreddit_json(query, subreddit)
-                results.extend(subreddit_results)
+            # Otherwise use Reddit JSON API (no auth required), subreddits searched concurrently
+            pushshift_task = None
+            if not any(batches):
+                # Hedge with pushshift alongside, in case the subreddit searches come back thin
+                pushshift_task = asyncio.ensure_future(cls._search_pushshift(session, query, subreddits))
+                tasks = [
+                    cls._search_subreddit_json(session, query, subreddit)
+                    for subreddit in subreddits[:3]  # Limit to avoid rate limits
+                ]
+                batches = [batch for batch in await asyncio.gather(*tasks, return_exceptions=True) if isinstance(batch, list)]
             
             # Method 2: Use pushshift.io as backup (if available)
-            if len(results) < 5:
-                pushshift_results = await RedditConnector._search_pushshift(query, subreddits)
-                results.extend(pushshift_results)
-            
-            # Remove duplicates and limit results
-            seen_urls = set()
-            unique_results = []
-            for result in results:
-                if result['url'] not in seen_urls and len(unique_results) < 10:
-                    seen_urls.add(result['url'])
-                    unique_results.append(result)
+            if sum(len(batch) for batch in batches) < 5:
+                batches.append(await (pushshift_task or cls._search_pushshift(session, query, subreddits)))
+            elif pushshift_task:
+                pushshift_task.cancel()
+            
+            unique_results = cls._unique_posts(batches)
             
             logger.info(f"Found {len(unique_results)} Reddit posts for: {query}")
             
@@ -94,107 +379,148 @@ class RedditConnector:
             if not unique_results:
                 logger.warning("No Reddit results found from APIs, falling back to mock data")
                 raise Exception("All Reddit API calls returned empty results")
-                
+            
+            # Only real results are cached; the mock fallback below never is
+            cls._results_cache[key] = unique_results
             return unique_results
             
         except Exception as e:
             logger.error(f"Reddit API error: {e}")
-            logger.warning("USING MOCK DATA: No Reddit credentials configured. See ENABLE_REAL_DATA.md")
-            # Return multiple fallback posts if APIs fail
-            return [
-                {
-                    "title": f"Discussion: {query} latest developments",
-                    "content": f"Retail investors are actively discussing {query}. Key points include: regulatory compliance costs, supply chain transparency requirements, and investor expectations for ESG reporting. Some users highlight potential competitive advantages from early adoption of sustainable practices.",
-                    "url": f"https://reddit.com/r/investing/posts/12345-{query.replace(' ', '-').lower()}",
-                    "subreddit": "investing",
-                    "score": 147,
-                    "num_comments": 42,
-                    "created_utc": datetime.now().isoformat()
-                },
-                {
-                    "title": f"{query} ESG analysis - worth the investment?",
-                    "content": f"Mixed opinions on {query} ESG initiatives. Bulls argue that sustainability investments drive long-term value and reduce regulatory risk. Bears worry about near-term costs and implementation challenges. Most agree that transparent reporting is crucial for investor confidence.",
-                    "url": f"https://reddit.com/r/SecurityAnalysis/posts/67890-{query.replace(' ', '-').lower()}-esg",
-                    "subreddit": "SecurityAnalysis", 
-                    "score": 89,
-                    "num_comments": 28,
-                    "created_utc": datetime.now().isoformat()
-                },
-                {
-                    "title": f"Risk assessment: {query} climate exposure",
-                    "content": f"Analysis of {query} climate-related risks and opportunities. Physical risks include supply chain disruption from extreme weather. Transition risks include carbon pricing and changing consumer preferences. Opportunities include market leadership in clean technology.",
-                    "url": f"https://reddit.com/r/stocks/posts/24680-{query.replace(' ', '-').lower()}-climate",
-                    "subreddit": "stocks",
-                    "score": 203,
-                    "num_comments": 67,
-                    "created_utc": datetime.now().isoformat()
-                },
-                {
-                    "title": f"Institutional perspective on {query} sustainability",
-                    "content": f"Large institutional investors are increasingly focused on {query} ESG metrics. BlackRock and Vanguard have raised questions about long-term sustainability strategies. Proxy voting trends show growing support for climate-related shareholder proposals.",
-                    "url": f"https://reddit.com/r/ValueInvesting/posts/13579-{query.replace(' ', '-').lower()}-institutional",
-                    "subreddit": "ValueInvesting",
-                    "score": 156,
-                    "num_comments": 38,
-                    "created_utc": datetime.now().isoformat()
-                },
-                {
-                    "title": f"{query} quarterly earnings call - ESG highlights",
-                    "content": f"Recent earnings call included significant discussion of {query} ESG initiatives and climate commitments. Management emphasized progress on renewable energy goals and supply chain sustainability. Analysts asked pointed questions about carbon accounting and disclosure standards.",
-                    "url": f"https://reddit.com/r/financialindependence/posts/97531-{query.replace(' ', '-').lower()}-earnings",
-                    "subreddit": "financialindependence",
-                    "score": 94,
-                    "num_comments": 23,
-                    "created_utc": datetime.now().isoformat()
-                }
-            ]
+            return cls._mock_posts(query)
+    
+    @classmethod
+    def _unique_posts(cls, batches: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Remove duplicates by URL, stopping as soon as we have enough results"""
+        unique = {}
+        for result in chain.from_iterable(batches):
+            url = result['url']
+            if url in unique:
+                continue
+            unique[url] = result
+            if len(unique) >= cls.MAX_RESULTS:
+                break
+        return list(unique.values())
+    
+    @classmethod
+    def _new_posts(cls, batch: List[Dict[str, Any]], seen_urls: set):
+        """Yield the posts in batch not streamed yet, up to MAX_RESULTS in total"""
+        for post in batch:
+            if len(seen_urls) >= cls.MAX_RESULTS:
+                return
+            if post['url'] not in seen_urls:
+                seen_urls.add(post['url'])
+                yield post
     
     @staticmethod
-    async def _search_subreddit_json(query: str, subreddit: str) -> List[Dict[str, Any]]:
-        """Search a specific subreddit using Reddit's JSON API"""
+    def _mock_posts(query: str) -> List[Dict[str, Any]]:
+        """Fallback posts for when every Reddit source fails"""
+        logger.warning("USING MOCK DATA: No Reddit credentials configured. See ENABLE_REAL_DATA.md")
+        slug = query.replace(' ', '-').lower()
+        now = datetime.now().isoformat()
+        return [
+            {
+                **{k: v.format(query=query, slug=slug) if isinstance(v, str) else v for k, v in post.items()},
+                "created_utc": now
+            }
+            for post in _MOCK_POSTS
+        ]
+    
+    @classmethod
+    async def _search_oauth(cls, session: aiohttp.ClientSession, token: str, query: str, subreddits: List[str]) -> List[Dict[str, Any]]:
+        """Search several subreddits in one request through Reddit's OAuth API"""
         try:
-            search_url = f"https://www.reddit.com/r/{subreddit}/search.json"
+            search_url = f"https://oauth.reddit.com/r/{'+'.join(subreddits[:5])}/search"
             params = {
                 'q': query,
                 'sort': 'relevance',
                 'limit': 10,
-                'restrict_sr': 1  # Restrict to this subreddit
+                'restrict_sr': 1
             }
-            
             headers = {
-                'User-Agent': 'SecureAsk/1.0 (hackathon demo)'
+                'Authorization': f'Bearer {token}',
+                'User-Agent': os.getenv('REDDIT_USER_AGENT', 'SecureAsk/1.0')
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        posts = []
-                        
-                        for post_data in data.get('data', {}).get('children', []):
-                            post = post_data.get('data', {})
-                            if post:
-                                posts.append({
-                                    "title": post.get('title', ''),
-                                    "content": (post.get('selftext', '') or post.get('title', ''))[:500],
-                                    "url": f"https://reddit.com{post.get('permalink', '')}",
-                                    "subreddit": subreddit,
-                                    "score": post.get('score', 0),
-                                    "num_comments": post.get('num_comments', 0),
-                                    "created_utc": datetime.fromtimestamp(post.get('created_utc', 0)).isoformat()
-                                })
-                        
-                        return posts[:3]  # Limit per subreddit
-                    else:
-                        logger.warning(f"Reddit API returned {response.status} for r/{subreddit}")
-                        return []
-                        
+            status, data = await cls._get_json(session, cls._reddit_limiter, search_url, params=params, headers=headers)
+            if status == 200:
+                posts = []
+                posts_append = posts.append
+                
+                for post_data in data.get('data', {}).get('children', []):
+                    post = post_data.get('data', {})
+                    if post:
+                        g = post.get
+                        title = g('title', '')
+                        posts_append({
+                            "title": title,
+                            "content": (g('selftext', '') or title)[:500],
+                            "url": f"https://reddit.com{g('permalink', '')}",
+                            "subreddit": g('subreddit', ''),
+                            "score": g('score', 0),
+                            "num_comments": g('num_comments', 0),
+                            "created_utc": ts_iso(g('created_utc', 0))
+                        })
+                
+                return posts
+            else:
+                logger.warning(f"Reddit OAuth search returned {status}")
+                return []
+                    
+        except Exception as e:
+            logger.error(f"Error with Reddit OAuth search: {e}")
+            return []
+    
+    @classmethod
+    async def _search_subreddit_json(cls, session: aiohttp.ClientSession, query: str, subreddit: str) -> List[Dict[str, Any]]:
+        """Search a specific subreddit using Reddit's JSON API"""
+        cache_key = (query.strip().lower(), subreddit.lower())
+        cached = cls._subreddit_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            search_url = f"https://www.reddit.com/r/{subreddit}/search.json"
+            params = {
+                'q': query,
+                'sort': 'relevance',
+                'limit': cls.POSTS_PER_SUBREDDIT,  # Only fetch what we keep
+                'restrict_sr': 1  # Restrict to this subreddit
+            }
+            
+            status, data = await cls._get_json(session, cls._reddit_limiter, search_url, params=params)
+            if status == 200:
+                posts = []
+                posts_append = posts.append
+                
+                for post_data in data.get('data', {}).get('children', []):
+                    post = post_data.get('data', {})
+                    if post:
+                        g = post.get
+                        title = g('title', '')
+                        posts_append({
+                            "title": title,
+                            "content": (g('selftext', '') or title)[:500],
+                            "url": f"https://reddit.com{g('permalink', '')}",
+                            "subreddit": subreddit,
+                            "score": g('score', 0),
+                            "num_comments": g('num_comments', 0),
+                            "created_utc": ts_iso(g('created_utc', 0))
+                        })
+                        if len(posts) == cls.POSTS_PER_SUBREDDIT:
+                            break
+                
+                cls._subreddit_cache[cache_key] = posts
+                return posts
+            else:
+                logger.warning(f"Reddit API returned {status} for r/{subreddit}")
+                return []
+                    
         except Exception as e:
             logger.error(f"Error searching r/{subreddit}: {e}")
             return []
     
-    @staticmethod
-    async def _search_pushshift(query: str, subreddits: List[str]) -> List[Dict[str, Any]]:
+    @classmethod
+    async def _search_pushshift(cls, session: aiohttp.ClientSession, query: str, subreddits: List[str]) -> List[Dict[str, Any]]:
         """Search using pushshift.io API as backup"""
         try:
             pushshift_url = "https://api.pushshift.io/reddit/search/submission"
@@ -206,32 +532,29 @@ class RedditConnector:
                 'sort_type': 'desc'
             }
             
-            headers = {
-                'User-Agent': 'SecureAsk/1.0 (hackathon demo)'
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(pushshift_url, params=params, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        posts = []
-                        
-                        for post in data.get('data', []):
-                            posts.append({
-                                "title": post.get('title', ''),
-                                "content": (post.get('selftext', '') or post.get('title', ''))[:500],
-                                "url": f"https://reddit.com{post.get('permalink', '')}",
-                                "subreddit": post.get('subreddit', ''),
-                                "score": post.get('score', 0),
-                                "num_comments": post.get('num_comments', 0),
-                                "created_utc": datetime.fromtimestamp(post.get('created_utc', 0)).isoformat()
-                            })
-                        
-                        return posts
-                    else:
-                        logger.warning(f"Pushshift API returned {response.status}")
-                        return []
-                        
+            status, data = await cls._get_json(session, cls._pushshift_limiter, pushshift_url, params=params)
+            if status == 200:
+                posts = []
+                posts_append = posts.append
+                
+                for post in data.get('data', []):
+                    g = post.get
+                    title = g('title', '')
+                    posts_append({
+                        "title": title,
+                        "content": (g('selftext', '') or title)[:500],
+                        "url": f"https://reddit.com{g('permalink', '')}",
+                        "subreddit": g('subreddit', ''),
+                        "score": g('score', 0),
+                        "num_comments": g('num_comments', 0),
+                        "created_utc": ts_iso(g('created_utc', 0))
+                    })
+                
+                return posts
+            else:
+                logger.warning(f"Pushshift API returned {status}")
+                return []
+                    
         except Exception as e:
             logger.error(f"Error with pushshift API: {e}")
             return []
\ No newline at end of file
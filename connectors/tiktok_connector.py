@@ -3,13 +3,18 @@ TikTok API connector for SecureAsk using Apify
 """
 
 import asyncio
+import hashlib
 import logging
+import math
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import aiohttp
 import json
+import orjson
 from datetime import datetime
 
+from connectors.utils import release_session, ts_iso
+
 logger = logging.getLogger(__name__)
 
 class TikTokConnector:
@@ -17,9 +22,87 @@ class TikTokConnector:
     
     APIFY_BASE_URL = "https://api.apify.com/v2"
     ACTOR_ID = "clockworks/free-tiktok-scraper"  # Free TikTok scraper
+    POLL_ATTEMPTS = 3
+    POLL_INITIAL_DELAY = 0.5
+    POLL_MAX_DELAY = 8
+    MAX_WAIT_FOR_FINISH = 60  # Apify's cap on waitForFinish
+    POLL_REQUEST_SLACK = 5  # Network allowance on top of waitForFinish for each status request
+    # Let Apify trim and project dataset items to what _format_tiktok_results reads
+    DATASET_PARAMS = {
+        "limit": 10,
+        "fields": "text,webVideoUrl,authorMeta,playCount,diggCount,commentCount,createTime,hashtags",
+        "clean": 1
+    }
+    
+    # Session and in-flight tasks belong to one event loop; _bind_loop recreates them per loop
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _session: Optional[aiohttp.ClientSession] = None
+    _inflight: Dict[str, asyncio.Task] = {}
+    
+    @classmethod
+    async def _bind_loop(cls):
+        """Recreate the loop-bound state when called from a new event loop (e.g. a later asyncio.run)"""
+        loop = asyncio.get_running_loop()
+        if cls._loop is loop:
+            return
+        # Swap everything in before awaiting, so concurrent callers on the new loop see it already bound
+        stale_session, stale_loop = cls._session, cls._loop
+        cls._loop = loop
+        cls._session = None
+        cls._inflight = {}
+        await release_session(stale_session, stale_loop)
+    
+    @classmethod
+    async def _get_session(cls) -> aiohttp.ClientSession:
+        """Get the shared HTTP session for the running loop, creating it on first use"""
+        await cls._bind_loop()
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=10,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                )
+            )
+        return cls._session
+    
+    @classmethod
+    async def close(cls):
+        """Close the shared HTTP session"""
+        if cls._session and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+    
+    @classmethod
+    async def warm_up(cls):
+        """Resolve DNS and open a pooled TLS connection to Apify ahead of the first query"""
+        try:
+            session = await cls._get_session()
+            async with session.head("https://api.apify.com/", allow_redirects=False, timeout=aiohttp.ClientTimeout(total=3)):
+                pass
+        except Exception as e:
+            logger.warning(f"Apify connection warm-up failed: {e}")
     
     @classmethod
     async def search_content(cls, query: str, count: int = 10) -> List[Dict[str, Any]]:
+        """Search TikTok content, sharing one upstream run between concurrent identical queries"""
+        key = hashlib.blake2b(
+            f"{query.strip().lower()}|{count}".encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        
+        await cls._bind_loop()
+        task = cls._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(cls._search_content(query, count))
+            cls._inflight[key] = task
+            task.add_done_callback(lambda _: cls._inflight.pop(key, None))
+        
+        return await asyncio.shield(task)
+    
+    @classmethod
+    async def _search_content(cls, query: str, count: int = 10) -> List[Dict[str, Any]]:
         """Search TikTok content for financial discussions"""
         try:
             logger.info(f"Searching TikTok for: {query}")
@@ -44,19 +127,19 @@ class TikTokConnector:
                 "shouldDownloadCovers": False
             }
             
-            async with aiohttp.ClientSession() as session:
-                # Start the scraper
-                async with session.post(run_url, json=search_input, headers=headers) as response:
-                    if response.status == 201:
-                        run_data = await response.json()
-                        run_id = run_data['data']['id']
-                        
-                        # Wait for completion (with timeout)
-                        results = await cls._wait_for_results(session, run_id, headers)
-                        return results
-                    else:
-                        logger.error(f"Failed to start TikTok scraper: {response.status}")
-                        return await cls._get_fallback_data(query)
+            session = await cls._get_session()
+            # Start the scraper
+            async with session.post(run_url, json=search_input, headers=headers) as response:
+                if response.status == 201:
+                    run_data = await response.json(loads=orjson.loads)
+                    run_id = run_data['data']['id']
+                    
+                    # Wait for completion (with timeout)
+                    results = await cls._wait_for_results(session, run_id, headers)
+                    return results
+                else:
+                    logger.error(f"Failed to start TikTok scraper: {response.status}")
+                    return await cls._get_fallback_data(query)
             
         except Exception as e:
             logger.error(f"TikTok API error: {e}")
@@ -64,24 +147,40 @@ class TikTokConnector:
     
     @classmethod
     async def _wait_for_results(cls, session: aiohttp.ClientSession, run_id: str, headers: dict, timeout: int = 30) -> List[Dict[str, Any]]:
-        """Wait for Apify run to complete and return results"""
+        """Wait up to `timeout` seconds in total for Apify run to complete and return results"""
         try:
             status_url = f"{cls.APIFY_BASE_URL}/actor-runs/{run_id}"
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            delay = cls.POLL_INITIAL_DELAY
             
-            for _ in range(timeout):  # Wait up to 30 seconds
-                await asyncio.sleep(1)
+            for attempt in range(cls.POLL_ATTEMPTS):
+                if attempt:
+                    await asyncio.sleep(min(delay, max(0, deadline - loop.time())))
+                    delay = min(cls.POLL_MAX_DELAY, delay * 2)
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
                 
-                async with session.get(status_url, headers=headers) as response:
+                # Apify holds the request open until the run finishes or waitForFinish seconds pass
+                wait = math.ceil(min(remaining, cls.MAX_WAIT_FOR_FINISH))
+                async with session.get(
+                    status_url,
+                    params={"waitForFinish": wait},
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=wait + cls.POLL_REQUEST_SLACK)
+                ) as response:
                     if response.status == 200:
-                        status_data = await response.json()
+                        status_data = await response.json(loads=orjson.loads)
                         status = status_data['data']['status']
                         
                         if status == 'SUCCEEDED':
                             # Get results
                             results_url = f"{cls.APIFY_BASE_URL}/actor-runs/{run_id}/dataset/items"
-                            async with session.get(results_url, headers=headers) as results_response:
+                            async with session.get(results_url, params=cls.DATASET_PARAMS, headers=headers) as results_response:
                                 if results_response.status == 200:
-                                    raw_results = await results_response.json()
+                                    raw_results = await results_response.json(loads=orjson.loads)
                                     return cls._format_tiktok_results(raw_results)
                         elif status in ['FAILED', 'ABORTED']:
                             logger.error(f"TikTok scraper failed with status: {status}")
@@ -98,18 +197,21 @@ class TikTokConnector:
     def _format_tiktok_results(cls, raw_results: List[Dict]) -> List[Dict[str, Any]]:
         """Format raw TikTok results for our API"""
         formatted = []
+        now_iso = datetime.now().isoformat()
         
-        for item in raw_results[:10]:  # Limit results
+        for item in raw_results:  # Already limited by DATASET_PARAMS
             try:
+                text = item.get('text') or ''
+                created = item.get('createTime')
                 formatted.append({
-                    "title": item.get('text', '')[:100],  # TikTok description
-                    "content": item.get('text', ''),
+                    "title": text[:100],  # TikTok description
+                    "content": text,
                     "url": item.get('webVideoUrl', ''),
-                    "author": item.get('authorMeta', {}).get('name', ''),
+                    "author": (item.get('authorMeta') or {}).get('name', ''),
                     "views": item.get('playCount', 0),
                     "likes": item.get('diggCount', 0),
                     "comments": item.get('commentCount', 0),
-                    "created_utc": datetime.fromtimestamp(item.get('createTime', 0)).isoformat() if item.get('createTime') else datetime.now().isoformat(),
+                    "created_utc": ts_iso(created) if created else now_iso,
                     "hashtags": item.get('hashtags', [])
                 })
             except Exception as e:
@@ -0,0 +1,26 @@
+"""
+Shared helpers for SecureAsk external API connectors
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import aiohttp
+
+
+def ts_iso(ts: float) -> str:
+    """Format a Unix timestamp as an ISO 8601 UTC string without building a datetime"""
+    return "%04d-%02d-%02dT%02d:%02d:%02d" % time.gmtime(ts)[:6]
+
+
+async def release_session(session: Optional[aiohttp.ClientSession], loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Release a session created on another event loop"""
+    if session is None or session.closed:
+        return
+    if loop is not None and loop.is_running():
+        # Still serving elsewhere (another thread); close it on its own loop
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+        return
+    # Its loop has finished; closing the owned connector only drops the pooled sockets, which is safe from here
+    await session.close()
\ No newline at end of file
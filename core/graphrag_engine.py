@@ -9,13 +9,19 @@ import time
 import uuid
 import re
 import hashlib
+from collections import defaultdict
+from contextlib import aclosing
+from dataclasses import dataclass
+from itertools import islice
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Dict, Any, Tuple
+from weakref import WeakValueDictionary
 import structlog
 
 from core.models import (
-    QueryRequest, QueryResponse, QueryStatus, QueryResult, Citation, 
-    ProcessingContext, SourceType, ExternalAPIResponse
+    QueryRequest, QueryResponse, QueryStatus, QueryResult,
+    ProcessingContext, SourceType, ExternalAPIResponse, Citation
 )
 from connectors.sec_connector import SECConnector
 from connectors.reddit_connector import RedditConnector
@@ -23,13 +29,104 @@ from connectors.tiktok_connector import TikTokConnector
 
 logger = structlog.get_logger(__name__)
 
+# Common company tickers and names, one named group per ticker so a single scan finds the first mention
+TICKER_RE = re.compile(
+    r'\b(?:'
+    r'(?P<AAPL>AAPL|Apple)|'
+    r'(?P<MSFT>MSFT|Microsoft)|'
+    r'(?P<GOOGL>GOOGL|GOOG|Google|Alphabet)|'
+    r'(?P<AMZN>AMZN|Amazon)|'
+    r'(?P<TSLA>TSLA|Tesla)|'
+    r'(?P<META>META|Facebook|Meta)|'
+    r'(?P<NVDA>NVDA|Nvidia)|'
+    r'(?P<NFLX>NFLX|Netflix)|'
+    r'(?P<CRM>CRM|Salesforce)|'
+    r'(?P<ORCL>ORCL|Oracle)'
+    r')\b',
+    re.IGNORECASE
+)
+
+# Common question words left out of social media search terms
+STOP_WORDS = frozenset({'what', 'are', 'the', 'is', 'how', 'does', 'do', 'can', 'will', 'would', 'should'})
+WORD_RE = re.compile(r'\b\w+\b')
+
+# Terms that mark a sentence as relevant when they appear in the question
+SNIPPET_TERMS_RE = re.compile('|'.join(map(re.escape, [
+    'climate', 'risk', 'esg', 'disclosure', 'apple', 'tesla',
+    'supply chain', 'regulatory', 'environmental', 'social',
+    'governance', '10-k', '10k', '2024', '2023', 'carbon',
+    'emissions', 'sustainability'
+])))
+
+@lru_cache(maxsize=1024)
+def terms_digest(terms: str) -> str:
+    """Hash search terms once for every social media cache key built from them"""
+    return hashlib.md5(terms.encode()).hexdigest()
+
+@dataclass(frozen=True)
+class SourceConfig:
+    """How one external source is searched, cached and labelled"""
+    source: SourceType
+    label: str
+    cache_source: str
+    search: Callable[[str], Awaitable[List[Dict]]]
+    ttl: int
+    timeout: Optional[float]  # Upper bound on one fetch, longer than the connector's own retry/poll budget
+    param_name: str
+    cache_key: Callable[[str], str]
+
 class GraphRAGEngine:
     """Main GraphRAG processing engine for SecureAsk"""
     
+    # How each external source is fetched and cached
+    SOURCES: Dict[SourceType, SourceConfig] = {
+        SourceType.SEC: SourceConfig(
+            source=SourceType.SEC,
+            label="SEC",
+            cache_source="sec",
+            search=lambda ticker: SECConnector.search_filings(ticker, "10-K"),
+            ttl=3600,  # 1 hour TTL
+            timeout=None,  # In-memory lookup, no upstream I/O
+            param_name="ticker",
+            cache_key=lambda ticker: f"sec_filings_{ticker}_10K"
+        ),
+        SourceType.REDDIT: SourceConfig(
+            source=SourceType.REDDIT,
+            label="Reddit",
+            cache_source="reddit",
+            search=lambda terms: RedditConnector.search_posts(terms),
+            ttl=900,  # 15 minutes TTL, shorter for social media
+            timeout=30.0,  # Token exchange plus one round of searches at 10s per request; later retries are cut off
+            param_name="search_terms",
+            cache_key=lambda terms: f"reddit_posts_{terms_digest(terms)}"
+        ),
+        SourceType.TIKTOK: SourceConfig(
+            source=SourceType.TIKTOK,
+            label="TikTok",
+            cache_source="tiktok",
+            search=lambda terms: TikTokConnector.search_content(terms),
+            ttl=900,  # 15 minutes TTL, shorter for social media
+            timeout=40.0,  # Starting the Apify run plus its 30s polling budget and the dataset fetch
+            param_name="search_terms",
+            cache_key=lambda terms: f"tiktok_content_{terms_digest(terms)}"
+        ),
+    }
+    
+    # Overall budget for the external fan-out, so one slow source cannot hold a query past it
+    FETCH_DEADLINE = 45.0
+    
+    # Per source: citation count, snippet length, confidence and node id builder
+    _CITATION_PLAN = (
+        (SourceType.SEC, 5, 500, 0.95, lambda row: f"sec_{row.get('cik', 'unknown')}_{row.get('accession', 'unknown')}"),
+        (SourceType.REDDIT, 5, 400, 0.78, lambda row: f"reddit_{GraphRAGEngine._url_digest(row.get('url', ''))}"),
+        (SourceType.TIKTOK, 3, 300, 0.65, lambda row: f"tiktok_{GraphRAGEngine._url_digest(row.get('url', ''))}"),
+    )
+    
     def __init__(self, neo4j_client, redis_client):
         self.neo4j = neo4j_client
         self.redis = redis_client
-        self.active_queries: Dict[str, ProcessingContext] = {}
+        # Entries drop out on their own once a query's context is released
+        self.active_queries: WeakValueDictionary[str, ProcessingContext] = WeakValueDictionary()
         
     async def initialize(self):
         """Initialize the GraphRAG engine"""
@@ -61,7 +158,7 @@ class GraphRAGEngine:
         """
         logger.info("🚀 PROCESS_QUERY CALLED", question=question, sources=sources, max_hops=max_hops, include_answer=include_answer)
         start_time = time.time()
-        query_id = str(uuid.uuid4())
+        query_id = uuid.uuid4().hex
         sources = sources or [SourceType.SEC, SourceType.REDDIT, SourceType.TIKTOK]
         
         context = ProcessingContext(
@@ -82,43 +179,11 @@ class GraphRAGEngine:
             logger.info("Found relevant nodes", node_count=len(relevant_nodes))
             
             # Step 2: Fetch external data if needed
-            external_data = await self._fetch_external_data(question, sources)
+            external_data = await self._fetch_external_data(question, sources, context.start_time.isoformat())
             logger.info("External data fetched", source_count=len(external_data))
             
-            # Step 3: Update graph with new information
-            if external_data:
-                await self._update_graph_with_external_data(external_data)
-            
-            # Step 4: Run GraphRAG reasoning
-            result = await self._run_graphrag_reasoning(
-                question, relevant_nodes, external_data, include_answer
-            )
-            
-            processing_time = int((time.time() - start_time) * 1000)
-            
-            response = QueryResponse(
-                query_id=query_id,
-                question=question,
-                status=QueryStatus.COMPLETED,
-                result=QueryResult(
-                    answer=result["answer"],
-                    citations=result["citations"],
-                    graph_path=result["graph_path"],
-                    processing_time=processing_time
-                ),
-                created_at=context.start_time,
-                completed_at=datetime.utcnow()
-            )
-            
-            # Cache the result using enhanced caching (only if Redis is available)
-            if self.redis:
-                try:
-                    query_hash = hashlib.md5(f"{question}:{sorted(sources)}:{max_hops}".encode()).hexdigest()
-                    await self.redis.cache_query_result(query_hash, response.model_dump(), ttl=1800)
-                except Exception as cache_error:
-                    logger.warning("Failed to cache query result", error=str(cache_error))
-            
-            return response
+            # Steps 3-4: Update the graph, reason over the data and cache the result
+            return await self._complete_query(context, relevant_nodes, external_data, include_answer, start_time)
             
         except Exception as e:
             processing_time = int((time.time() - start_time) * 1000)
@@ -131,9 +196,115 @@ class GraphRAGEngine:
                 created_at=context.start_time,
                 completed_at=datetime.utcnow()
             )
-        finally:
-            # Cleanup
-            self.active_queries.pop(query_id, None)
+    
+    async def _complete_query(
+        self,
+        context: ProcessingContext,
+        relevant_nodes: List[Dict],
+        external_data: List[ExternalAPIResponse],
+        include_answer: bool,
+        start_time: float
+    ) -> QueryResponse:
+        """Reason over fetched data, then build and cache the completed response"""
+        question = context.question
+        
+        # Step 3: Update graph with new information
+        if external_data:
+            await self._update_graph_with_external_data(external_data)
+        
+        # Step 4: Run GraphRAG reasoning
+        result = await self._run_graphrag_reasoning(
+            question, relevant_nodes, external_data, include_answer
+        )
+        
+        processing_time = int((time.time() - start_time) * 1000)
+        
+        response = QueryResponse(
+            query_id=context.query_id,
+            question=question,
+            status=QueryStatus.COMPLETED,
+            result=QueryResult(
+                answer=result["answer"],
+                citations=result["citations"],
+                graph_path=result["graph_path"],
+                processing_time=processing_time
+            ),
+            created_at=context.start_time,
+            completed_at=datetime.utcnow()
+        )
+        
+        # Cache the result using enhanced caching (only if Redis is available)
+        if self.redis:
+            try:
+                query_hash = self.query_hash(question, context.sources, context.max_hops)
+                # Serialize straight to JSON in pydantic-core rather than building a dict to re-encode
+                await self.redis.cache_query_result(query_hash, response.model_dump_json(), ttl=1800)
+            except Exception as cache_error:
+                logger.warning("Failed to cache query result", error=str(cache_error))
+        
+        return response
+    
+    async def _get_cached_result(self, question: str, sources: List[SourceType], max_hops: int) -> Optional[Dict]:
+        """Look up a completed query result cached by _complete_query (only if Redis is available)"""
+        if not self.redis:
+            return None
+        try:
+            return await self.redis.get_cached_query_result(self.query_hash(question, sources, max_hops))
+        except Exception as cache_error:
+            logger.warning("Redis cache unavailable", error=str(cache_error))
+            return None
+    
+    @staticmethod
+    def query_hash(question: str, sources: List[SourceType], max_hops: int) -> str:
+        """Cache key for a query; questions differing only in case, spacing or end punctuation share it"""
+        normalized = ' '.join(question.lower().split()).strip(' ?!.')
+        return hashlib.md5(f"{normalized}:{sorted(sources)}:{max_hops}".encode()).hexdigest()
+    
+    async def process_query_stream(
+        self,
+        question: str,
+        max_hops: int = 2,
+        sources: List[SourceType] = None,
+        user_id: str = "demo",
+        include_answer: bool = True
+    ) -> AsyncIterator[bytes]:
+        """Yield citations as NDJSON lines as soon as each source's data arrives, caching the result like process_query"""
+        start_time = time.time()
+        query_id = uuid.uuid4().hex
+        sources = sources or [SourceType.SEC, SourceType.REDDIT, SourceType.TIKTOK]
+        
+        context = ProcessingContext(
+            user_id=user_id,
+            query_id=query_id,
+            question=question,
+            max_hops=max_hops,
+            sources=sources
+        )
+        
+        self.active_queries[query_id] = context
+        logger.info("Streaming query", query_id=query_id, question_preview=question[:100])
+        
+        # Serve a cached result's citations without fetching anything
+        cached = await self._get_cached_result(question, sources, max_hops)
+        if cached and cached.get("result"):
+            logger.info("Streamed query served from cache", query_id=query_id)
+            for citation in cached["result"]["citations"]:
+                yield Citation.model_validate(citation).model_dump_json().encode() + b"\n"
+            return
+        
+        relevant_nodes = await self._find_relevant_nodes(question, max_hops)
+        external_data = []
+        async with aclosing(self._iter_external_data(question, sources, context.start_time.isoformat())) as responses:
+            async for response in responses:
+                external_data.append(response)
+                for citation in self._build_citations(question, {response.source: response.data}):
+                    yield citation.model_dump_json().encode() + b"\n"
+        
+        # Complete and cache the full result so later queries, streamed or not, are served from it
+        try:
+            await self._complete_query(context, relevant_nodes, external_data, include_answer, start_time)
+        except Exception as e:
+            logger.error("Streamed query completion failed", query_id=query_id, error=str(e), exc_info=True)
     
     async def _find_relevant_nodes(self, question: str, max_hops: int) -> List[Dict]:
         """Find relevant nodes in the graph using semantic search"""
@@ -161,11 +332,17 @@ class GraphRAGEngine:
         ]
     
     async def _fetch_external_data(
-        self, question: str, sources: List[SourceType]
+        self, question: str, sources: List[SourceType], query_time: str
     ) -> List[ExternalAPIResponse]:
         """Fetch relevant data from external sources using real APIs"""
-        external_data = []
-        
+        external_data = [response async for response in self._iter_external_data(question, sources, query_time)]
+        logger.info("External data collection complete", successful_sources=len(external_data))
+        return external_data
+    
+    async def _iter_external_data(
+        self, question: str, sources: List[SourceType], query_time: str
+    ) -> AsyncIterator[ExternalAPIResponse]:
+        """Yield each source's response as soon as its fetch completes"""
         # Extract company ticker from question for SEC queries
         company_ticker = self._extract_company_ticker(question)
         
@@ -175,212 +352,131 @@ class GraphRAGEngine:
         logger.info("Extracted query components", ticker=company_ticker, search_terms=search_terms)
         logger.info("Sources requested", sources=sources, source_types=[type(s).__name__ for s in sources])
         
-        # Fetch data from each source concurrently
-        tasks = []
+        # Work out which fetches to run and the cache entry each one uses
+        fetches = []
         for source in sources:
             logger.info("Processing source", source=source, source_type=type(source).__name__)
-            if source == SourceType.SEC and company_ticker:
-                logger.info("Adding SEC task", ticker=company_ticker)
-                tasks.append(self._fetch_sec_data(company_ticker))
-            elif source == SourceType.REDDIT:
-                logger.info("Adding Reddit task", search_terms=search_terms)
-                tasks.append(self._fetch_reddit_data(search_terms))
-            elif source == SourceType.TIKTOK:
-                logger.info("Adding TikTok task", search_terms=search_terms)
-                tasks.append(self._fetch_tiktok_data(search_terms))
-            else:
+            config = self.SOURCES.get(source)
+            param = None
+            if config:
+                param = company_ticker if config.param_name == "ticker" else search_terms
+            if param is None:
                 logger.warning("Unmatched source", source=source, source_value=str(source))
-        
-        # Execute all fetches concurrently
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            external_data = [r for r in results if isinstance(r, ExternalAPIResponse)]
-        
-        logger.info("External data collection complete", successful_sources=len(external_data))
-        return external_data
-    
-    def _extract_company_ticker(self, question: str) -> Optional[str]:
-        """Extract company ticker from question"""
-        # Common company tickers and names
-        ticker_patterns = {
-            r'\b(AAPL|Apple)\b': 'AAPL',
-            r'\b(MSFT|Microsoft)\b': 'MSFT',
-            r'\b(GOOGL|GOOG|Google|Alphabet)\b': 'GOOGL',
-            r'\b(AMZN|Amazon)\b': 'AMZN',
-            r'\b(TSLA|Tesla)\b': 'TSLA',
-            r'\b(META|Facebook|Meta)\b': 'META',
-            r'\b(NVDA|Nvidia)\b': 'NVDA',
-            r'\b(NFLX|Netflix)\b': 'NFLX',
-            r'\b(CRM|Salesforce)\b': 'CRM',
-            r'\b(ORCL|Oracle)\b': 'ORCL'
+                continue
+            logger.info("Adding fetch task", source=source, param=param)
+            fetches.append((config, param, config.cache_key(param)))
+        
+        # Look up every source's cache entry in a single Redis round trip (only if Redis is available)
+        cached = [None] * len(fetches)
+        if self.redis and fetches:
+            try:
+                cached = await self.redis.mget_cached([(config.cache_source, cache_key) for config, _, cache_key in fetches])
+            except Exception as cache_error:
+                logger.warning("Redis cache unavailable", error=str(cache_error))
+        
+        running = {
+            asyncio.ensure_future(self._fetch_source(config, param, query_time, cached_data)): (config, cache_key)
+            for (config, param, cache_key), cached_data in zip(fetches, cached)
         }
         
-        for pattern, ticker in ticker_patterns.items():
-            if re.search(pattern, question, re.IGNORECASE):
-                return ticker
-        
-        return None
-    
-    def _extract_search_terms(self, question: str) -> str:
-        """Extract relevant search terms from question"""
-        # Remove common question words and keep relevant terms
-        stop_words = {'what', 'are', 'the', 'is', 'how', 'does', 'do', 'can', 'will', 'would', 'should'}
-        words = re.findall(r'\b\w+\b', question.lower())
-        relevant_words = [w for w in words if w not in stop_words and len(w) > 2]
-        return ' '.join(relevant_words[:5])  # Limit to 5 most relevant terms
-    
-    async def _fetch_sec_data(self, ticker: str) -> ExternalAPIResponse:
-        """Fetch SEC filing data with caching"""
-        cache_key = f"sec_filings_{ticker}_10K"
-        
+        # Execute all fetches concurrently within FETCH_DEADLINE, cancelling the rest if the consumer stops early
+        # or is cancelled (a TaskGroup cannot span a yield: closing the generator would surface as an exception group)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.FETCH_DEADLINE
+        pending = set(running)
         try:
-            # Check cache first (only if Redis is available)
-            cached_data = None
-            if self.redis:
-                try:
-                    cached_data = await self.redis.get_cached_external_api_response("sec", cache_key)
-                except Exception as cache_error:
-                    logger.warning("Redis cache unavailable", error=str(cache_error))
-            
-            if cached_data:
-                logger.info("SEC data served from cache", ticker=ticker)
-                return ExternalAPIResponse(
-                    source=SourceType.SEC,
-                    data=cached_data,
-                    metadata={"ticker": ticker, "query_time": datetime.utcnow().isoformat()},
-                    cached=True
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
                 )
+                if not done:
+                    break
+                for task in done:
+                    yield task.result()
             
-            # Fetch fresh data
-            start_time = time.time()
-            filings = await SECConnector.search_filings(ticker, "10-K")
-            response_time = round((time.time() - start_time) * 1000, 2)
-            
-            # Cache the result - only if Redis is available
-            if self.redis:
-                try:
-                    await self.redis.cache_external_api_response("sec", cache_key, filings, ttl=3600)  # 1 hour TTL
-                except Exception as cache_error:
-                    logger.warning("Failed to cache SEC data", error=str(cache_error))
-            
-            logger.info("SEC data fetched and cached", ticker=ticker, response_time=response_time)
-            
-            return ExternalAPIResponse(
-                source=SourceType.SEC,
-                data=filings,
-                metadata={"ticker": ticker, "query_time": datetime.utcnow().isoformat(), "response_time": response_time},
-                cached=False
-            )
-        except Exception as e:
-            logger.error("SEC API error", ticker=ticker, error=str(e), exc_info=True)
-            return ExternalAPIResponse(
-                source=SourceType.SEC,
-                data=[],
-                metadata={"error": str(e)},
-                cached=False
-            )
-    
-    async def _fetch_reddit_data(self, search_terms: str) -> ExternalAPIResponse:
-        """Fetch Reddit discussion data with caching"""
-        cache_key = f"reddit_posts_{hashlib.md5(search_terms.encode()).hexdigest()}"
-        
-        try:
-            # Check cache first (only if Redis is available)
-            cached_data = None
-            if self.redis:
-                try:
-                    cached_data = await self.redis.get_cached_external_api_response("reddit", cache_key)
-                except Exception as cache_error:
-                    logger.warning("Redis cache unavailable", error=str(cache_error))
-            
-            if cached_data:
-                logger.info("Reddit data served from cache", search_terms=search_terms)
-                return ExternalAPIResponse(
-                    source=SourceType.REDDIT,
-                    data=cached_data,
-                    metadata={"search_terms": search_terms, "query_time": datetime.utcnow().isoformat()},
-                    cached=True
+            for task in pending:
+                config, _ = running[task]
+                logger.warning(f"{config.label} API missed the fetch deadline", deadline=self.FETCH_DEADLINE)
+                yield ExternalAPIResponse(
+                    source=config.source,
+                    data=[],
+                    metadata={"error": f"timed out after {self.FETCH_DEADLINE}s"},
+                    cached=False
                 )
-            
-            # Fetch fresh data
-            start_time = time.time()
-            posts = await RedditConnector.search_posts(search_terms)
-            response_time = round((time.time() - start_time) * 1000, 2)
-            
-            # Cache the result (shorter TTL for social media) - only if Redis is available
-            if self.redis:
-                try:
-                    await self.redis.cache_external_api_response("reddit", cache_key, posts, ttl=900)  # 15 minutes TTL
-                except Exception as cache_error:
-                    logger.warning("Failed to cache Reddit data", error=str(cache_error))
-            
-            logger.info("Reddit data fetched and cached", search_terms=search_terms, response_time=response_time)
-            
-            return ExternalAPIResponse(
-                source=SourceType.REDDIT,
-                data=posts,
-                metadata={"search_terms": search_terms, "query_time": datetime.utcnow().isoformat(), "response_time": response_time},
-                cached=False
-            )
-        except Exception as e:
-            logger.error("Reddit API error", search_terms=search_terms, error=str(e), exc_info=True)
-            return ExternalAPIResponse(
-                source=SourceType.REDDIT,
-                data=[],
-                metadata={"error": str(e)},
-                cached=False
-            )
+        finally:
+            for task in running:
+                task.cancel()
+        
+        # Write every fresh response back in a single pipelined round trip (only if Redis is available)
+        fresh = [
+            (config.cache_source, cache_key, task.result().data, config.ttl)
+            for task, (config, cache_key) in running.items()
+            if task.done() and not task.cancelled()
+            and not task.result().cached and "error" not in task.result().metadata
+        ]
+        if self.redis and fresh:
+            try:
+                await self.redis.mset_cached(fresh)
+            except Exception as cache_error:
+                logger.warning("Failed to cache external data", error=str(cache_error))
     
-    async def _fetch_tiktok_data(self, search_terms: str) -> ExternalAPIResponse:
-        """Fetch TikTok content data with caching"""
-        cache_key = f"tiktok_content_{hashlib.md5(search_terms.encode()).hexdigest()}"
-        
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_company_ticker(question: str) -> Optional[str]:
+        """Extract company ticker from question"""
+        match = TICKER_RE.search(question)
+        return match.lastgroup if match else None
+    
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _extract_search_terms(question: str) -> str:
+        """Extract relevant search terms from question"""
+        # Remove common question words and keep relevant terms
+        words = WORD_RE.findall(question.lower())
+        relevant_words = (w for w in words if w not in STOP_WORDS and len(w) > 2)
+        return ' '.join(islice(relevant_words, 5))  # Limit to 5 most relevant terms
+    
+    async def _fetch_source(
+        self, config: SourceConfig, param: str, query_time: str, cached_data: Optional[List[Dict]] = None
+    ) -> ExternalAPIResponse:
+        """Fetch one external source's data, serving the prefetched cache entry when there is one"""
         try:
-            # Check cache first (only if Redis is available)
-            cached_data = None
-            if self.redis:
-                try:
-                    cached_data = await self.redis.get_cached_external_api_response("tiktok", cache_key)
-                except Exception as cache_error:
-                    logger.warning("Redis cache unavailable", error=str(cache_error))
-            
+            # Serve from the cache entry looked up by _fetch_external_data
             if cached_data:
-                logger.info("TikTok data served from cache", search_terms=search_terms)
+                logger.info(f"{config.label} data served from cache", **{config.param_name: param})
                 return ExternalAPIResponse(
-                    source=SourceType.TIKTOK,
+                    source=config.source,
                     data=cached_data,
-                    metadata={"search_terms": search_terms, "query_time": datetime.utcnow().isoformat()},
+                    metadata={config.param_name: param, "query_time": query_time},
                     cached=True
                 )
             
             # Fetch fresh data
             start_time = time.time()
-            content = await TikTokConnector.search_content(search_terms)
+            data = await asyncio.wait_for(config.search(param), config.timeout)
             response_time = round((time.time() - start_time) * 1000, 2)
             
-            # Cache the result (shorter TTL for social media) - only if Redis is available
-            if self.redis:
-                try:
-                    await self.redis.cache_external_api_response("tiktok", cache_key, content, ttl=900)  # 15 minutes TTL
-                except Exception as cache_error:
-                    logger.warning("Failed to cache TikTok data", error=str(cache_error))
-            
-            logger.info("TikTok data fetched and cached", search_terms=search_terms, response_time=response_time)
+            logger.info(f"{config.label} data fetched", **{config.param_name: param}, response_time=response_time)
             
             return ExternalAPIResponse(
-                source=SourceType.TIKTOK,
-                data=content,
-                metadata={"search_terms": search_terms, "query_time": datetime.utcnow().isoformat(), "response_time": response_time},
+                source=config.source,
+                data=data,
+                metadata={config.param_name: param, "query_time": query_time, "response_time": response_time},
                 cached=False
             )
+        except asyncio.TimeoutError:
+            logger.warning(f"{config.label} API timed out", **{config.param_name: param}, timeout=config.timeout)
+            error = f"timed out after {config.timeout}s"
         except Exception as e:
-            logger.error("TikTok API error", search_terms=search_terms, error=str(e), exc_info=True)
-            return ExternalAPIResponse(
-                source=SourceType.TIKTOK,
-                data=[],
-                metadata={"error": str(e)},
-                cached=False
-            )
+            logger.error(f"{config.label} API error", **{config.param_name: param}, error=str(e), exc_info=True)
+            error = str(e)
+        
+        return ExternalAPIResponse(
+            source=config.source,
+            data=[],
+            metadata={"error": error},
+            cached=False
+        )
     
     async def _update_graph_with_external_data(
         self, external_data: List[ExternalAPIResponse]
@@ -402,59 +498,18 @@ class GraphRAGEngine:
         logger.info("Running GraphRAG reasoning", node_count=len(relevant_nodes), external_sources=len(external_data))
         
         # Collect all data sources for analysis
-        sec_data = []
-        reddit_data = []
-        tiktok_data = []
-        citations = []
-        
+        buckets = defaultdict(list)
         for response in external_data:
-            if response.source == SourceType.SEC:
-                sec_data.extend(response.data)
-            elif response.source == SourceType.REDDIT:
-                reddit_data.extend(response.data)
-            elif response.source == SourceType.TIKTOK:
-                tiktok_data.extend(response.data)
+            buckets[response.source].extend(response.data)
+        sec_data = buckets[SourceType.SEC]
+        reddit_data = buckets[SourceType.REDDIT]
+        tiktok_data = buckets[SourceType.TIKTOK]
         
         # Extract question-specific content
         answer_content = self._extract_relevant_content(question, sec_data, reddit_data, tiktok_data)
         
         # Build comprehensive citations with full content
-        # SEC citations - increase to 5
-        for filing in sec_data[:5]:
-            content = filing.get('content', '')
-            # Extract larger, more relevant snippet based on question keywords
-            snippet = self._extract_relevant_snippet(content, question, 500)
-            citations.append(Citation(
-                node_id=f"sec_{filing.get('cik', 'unknown')}_{filing.get('accession', 'unknown')}",
-                source=SourceType.SEC,
-                url=filing.get('url', ''),
-                snippet=snippet,
-                confidence=0.95
-            ).model_dump())
-        
-        # Reddit citations - increase to 5
-        for post in reddit_data[:5]:
-            content = post.get('content', '')
-            snippet = self._extract_relevant_snippet(content, question, 400)
-            citations.append(Citation(
-                node_id=f"reddit_{abs(hash(post.get('url', '')))}",
-                source=SourceType.REDDIT,
-                url=post.get('url', ''),
-                snippet=snippet,
-                confidence=0.78
-            ).model_dump())
-        
-        # TikTok citations - increase to 3
-        for content in tiktok_data[:3]:
-            text = content.get('content', '')
-            snippet = self._extract_relevant_snippet(text, question, 300)
-            citations.append(Citation(
-                node_id=f"tiktok_{abs(hash(content.get('url', '')))}",
-                source=SourceType.TIKTOK,
-                url=content.get('url', ''),
-                snippet=snippet,
-                confidence=0.65
-            ).model_dump())
+        citations = self._build_citations(question, buckets)
         
         # Build graph path showing reasoning flow
         graph_path = ["query_analysis"]
@@ -485,41 +540,79 @@ class GraphRAGEngine:
             }
         }
     
+    @staticmethod
+    def _url_digest(url: str) -> str:
+        """Short digest of a URL that stays the same across processes, unlike hash()"""
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def _build_citations(self, question: str, buckets: Dict[SourceType, List[Dict]]) -> List[Citation]:
+        """Build citations for each source's rows in one pass over the citation plan"""
+        # The fields come from our own connectors, so model_construct skips re-validating each one
+        return [
+            Citation.model_construct(
+                node_id=node_id(row),
+                source=source,
+                url=row.get('url', ''),
+                # Extract larger, more relevant snippet based on question keywords
+                snippet=self._extract_relevant_snippet(row.get('content', ''), question, snippet_length),
+                confidence=confidence
+            )
+            for source, limit, snippet_length, confidence, node_id in self._CITATION_PLAN
+            for row in islice(buckets.get(source, ()), limit)
+        ]
+    
     def _extract_relevant_content(self, question: str, sec_data: List[Dict], reddit_data: List[Dict], tiktok_data: List[Dict]) -> str:
         """Extract question-specific content from all sources"""
         # Return None to let MindStudio handle synthesis from raw citations
         # This prevents generic templated responses
         return None
     
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _snippet_keywords(question: str) -> Tuple[str, ...]:
+        """Extract keywords from question in one scan for all important terms"""
+        return tuple(dict.fromkeys(SNIPPET_TERMS_RE.findall(question.lower())))
+    
+    @staticmethod
+    def _score_sentences(content: str, keywords: Tuple[str, ...]) -> List[Tuple[int, str]]:
+        """Score each '. '-separated sentence by how many keywords it contains, keeping matches in order"""
+        content_lower = content.lower()
+        if len(content_lower) != len(content):
+            # Lowercasing changed offsets (rare Unicode), so score sentence by sentence
+            scored = ((sum(1 for keyword in keywords if keyword in sentence.lower()), sentence) for sentence in content.split('. '))
+            return [(score, sentence) for score, sentence in scored if score > 0]
+        
+        # Locate each keyword with str.find and widen it to its enclosing sentence, so the Python-level
+        # work scales with matches instead of sentences x keywords; no keyword contains '. ', so a match
+        # never spans two sentences
+        scores = defaultdict(int)
+        ends = {}
+        for keyword in keywords:
+            pos = content_lower.find(keyword)
+            while pos != -1:
+                start = content_lower.rfind('. ', 0, pos)
+                start = 0 if start == -1 else start + 2
+                end = content_lower.find('. ', pos)
+                if end == -1:
+                    end = len(content)
+                scores[start] += 1
+                ends[start] = end
+                # Each sentence counts a keyword once, so resume at the next sentence
+                pos = content_lower.find(keyword, end)
+        return [(scores[start], content[start:ends[start]]) for start in sorted(scores)]
+    
     def _extract_relevant_snippet(self, content: str, question: str, max_length: int = 500) -> str:
         """Extract relevant snippet based on question keywords"""
         if not content:
             return "No content available"
         
-        # Extract keywords from question
-        keywords = []
-        question_lower = question.lower()
-        
-        # Look for specific terms in the question
-        important_terms = ['climate', 'risk', 'esg', 'disclosure', 'apple', 'tesla', 
-                          'supply chain', 'regulatory', 'environmental', 'social', 
-                          'governance', '10-k', '10k', '2024', '2023', 'carbon', 
-                          'emissions', 'sustainability']
-        
-        for term in important_terms:
-            if term in question_lower:
-                keywords.append(term)
+        keywords = self._snippet_keywords(question)
+        if not keywords:
+            # Nothing to score sentences against; fall back to beginning of content
+            return content[:max_length] + '...' if len(content) > max_length else content
         
         # Find the most relevant section
-        sentences = content.split('. ')
-        relevant_sentences = []
-        
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            # Score sentence based on keyword matches
-            score = sum(1 for keyword in keywords if keyword in sentence_lower)
-            if score > 0:
-                relevant_sentences.append((score, sentence))
+        relevant_sentences = self._score_sentences(content, keywords)
         
         # Sort by relevance and take top sentences
         relevant_sentences.sort(key=lambda x: x[0], reverse=True)
@@ -596,7 +689,7 @@ class GraphRAGEngine:
         logger.info("Ingesting document", source=source, url=url[:100] if url else None)
         
         return {
-            "document_id": str(uuid.uuid4()),
+            "document_id": uuid.uuid4().hex,
             "triples_extracted": 42,
             "nodes_created": 15,
             "edges_created": 27
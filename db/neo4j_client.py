@@ -5,6 +5,7 @@ Neo4j client for SecureAsk knowledge graph operations
 import asyncio
 import logging
 import os
+import re
 from typing import List, Dict, Any, Optional
 from neo4j import AsyncGraphDatabase, AsyncSession
 from contextlib import asynccontextmanager
@@ -16,6 +17,15 @@ logger = logging.getLogger(__name__)
 class Neo4jClient:
     """Async Neo4j client for graph operations"""
     
+    FULLTEXT_INDEX = "nodeText"
+    # Every label in the documented schema, so the index covers what search_nodes used to scan
+    FULLTEXT_LABELS = ["Node", "Entity", "Concept", "Company", "Risk", "Document", "Topic", "Person"]
+    FULLTEXT_PROPERTIES = ["name", "description"]
+    MAX_RELATED_PATHS = 100
+    MAX_HOPS = 3
+    LUCENE_SPECIAL_CHARS = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+    LUCENE_OPERATORS = re.compile(r'\b(AND|OR|NOT)\b')
+    
     def __init__(self):
         self.driver = None
         self.uri = os.getenv("NEO4J_URI", "neo4j+s://5abb8f53.databases.neo4j.io")
@@ -28,7 +38,10 @@ class Neo4jClient:
             self.driver = AsyncGraphDatabase.driver(
                 self.uri,
                 auth=(self.user, self.password),
-                max_connection_pool_size=50
+                max_connection_pool_size=50,
+                connection_acquisition_timeout=5,
+                connection_timeout=5,
+                max_transaction_retry_time=15
             )
             
             # Test connection
@@ -36,11 +49,45 @@ class Neo4jClient:
                 result = await session.run("RETURN 'Connected' as status")
                 record = await result.single()
                 logger.info(f"✅ Neo4j connected: {record['status']}")
+            
+            await self.ensure_indexes()
                 
         except Exception as e:
             logger.error(f"❌ Failed to connect to Neo4j: {e}")
             raise
     
+    async def ensure_indexes(self):
+        """Create the full-text index used by search_nodes, recreating it if its labels or properties changed
+        
+        Also labels any unlabelled triple nodes :Node so the index covers them.
+        """
+        labels = "|".join(self.FULLTEXT_LABELS)
+        properties = ", ".join(f"n.{prop}" for prop in self.FULLTEXT_PROPERTIES)
+        try:
+            async with self.driver.session() as session:
+                # IF NOT EXISTS never updates an existing index, so drop one built for a different schema
+                result = await session.run(
+                    "SHOW FULLTEXT INDEXES YIELD name, labelsOrTypes, properties "
+                    "WHERE name = $name RETURN labelsOrTypes, properties",
+                    name=self.FULLTEXT_INDEX
+                )
+                record = await result.single()
+                if record and (
+                    set(record['labelsOrTypes']) != set(self.FULLTEXT_LABELS)
+                    or set(record['properties']) != set(self.FULLTEXT_PROPERTIES)
+                ):
+                    logger.info(f"Recreating full-text index {self.FULLTEXT_INDEX} for updated labels")
+                    await session.run(f"DROP INDEX {self.FULLTEXT_INDEX} IF EXISTS")
+                
+                await session.run(
+                    f"CREATE FULLTEXT INDEX {self.FULLTEXT_INDEX} IF NOT EXISTS "
+                    f"FOR (n:{labels}) ON EACH [{properties}]"
+                )
+                # Triples written before create_triples labelled its nodes have no label, so the index skips them
+                await session.run("MATCH (n) WHERE size(labels(n)) = 0 SET n:Node")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to create full-text index: {e}")
+    
     async def close(self):
         """Close Neo4j connection"""
         if self.driver:
@@ -59,37 +106,58 @@ class Neo4jClient:
         node_type: Optional[str] = None,
         limit: int = 10
     ) -> List[GraphNode]:
-        """Search nodes by text"""
+        """Search nodes by text using the full-text index"""
+        if not query_text.strip():
+            return []
+        
         try:
             async with self.session() as session:
-                if node_type:
-                    cypher = f"""
-                    MATCH (n:{node_type})
-                    WHERE n.name CONTAINS $query OR n.description CONTAINS $query
-                    RETURN n
-                    ORDER BY n.name
+                if node_type is None or node_type in self.FULLTEXT_LABELS:
+                    cypher = """
+                    CALL db.index.fulltext.queryNodes($index, $query) YIELD node, score
+                    WHERE $label IS NULL OR $label IN labels(node)
+                    RETURN coalesce(node.id, elementId(node)) AS id,
+                           node.name AS name,
+                           node.description AS description,
+                           labels(node)[0] AS label,
+                           node.source AS source
+                    ORDER BY score DESC
                     LIMIT $limit
                     """
+                    query = self._escape_lucene(query_text)
                 else:
+                    # Labels outside the index fall back to a substring scan
                     cypher = """
-                    MATCH (n)
-                    WHERE n.name CONTAINS $query OR n.description CONTAINS $query
-                    RETURN n
-                    ORDER BY n.name
+                    MATCH (node)
+                    WHERE $label IN labels(node)
+                      AND (node.name CONTAINS $query OR node.description CONTAINS $query)
+                    RETURN coalesce(node.id, elementId(node)) AS id,
+                           node.name AS name,
+                           node.description AS description,
+                           labels(node)[0] AS label,
+                           node.source AS source
+                    ORDER BY node.name
                     LIMIT $limit
                     """
+                    query = query_text
                 
-                result = await session.run(cypher, query=query_text, limit=limit)
+                result = await session.run(
+                    cypher,
+                    index=self.FULLTEXT_INDEX,
+                    query=query,
+                    label=node_type,
+                    limit=limit
+                )
                 nodes = []
                 
                 async for record in result:
-                    node = record['n']
+                    properties = {"name": record['name'], "description": record['description']}
                     nodes.append(GraphNode(
-                        id=node.get('id', str(node.id)),
-                        type=list(node.labels)[0] if node.labels else 'Node',
-                        name=node.get('name', ''),
-                        properties=dict(node),
-                        source=node.get('source', {})
+                        id=record['id'],
+                        type=record['label'] or 'Node',
+                        name=record['name'] or '',
+                        properties={k: v for k, v in properties.items() if v is not None},
+                        source=record['source'] or {}
                     ))
                 
                 return nodes
@@ -104,26 +172,31 @@ class Neo4jClient:
         max_hops: int = 2,
         relationship_types: Optional[List[str]] = None
     ) -> List[GraphPath]:
-        """Find nodes related to start node within max_hops"""
+        """Find nodes related to start node within max_hops (capped at MAX_HOPS)"""
         try:
             async with self.session() as session:
-                # Build relationship pattern
-                rel_pattern = ""
-                if relationship_types:
-                    rel_types = "|".join(f":{rt}" for rt in relationship_types)
-                    rel_pattern = f"[{rel_types}]"
-                else:
-                    rel_pattern = ""
-                
-                cypher = f"""
-                MATCH path = (start {{id: $start_id}})-[{rel_pattern}*1..{max_hops}]-(end)
-                WHERE start <> end
+                # APOC expansion stops once `limit` paths are found, so high-fan-out
+                # nodes never materialize more paths than we return
+                cypher = """
+                MATCH (start {id: $start_id})
+                CALL apoc.path.expandConfig(start, {
+                    minLevel: 1,
+                    maxLevel: $max_hops,
+                    relationshipFilter: $rel_filter,
+                    uniqueness: 'NODE_PATH',
+                    bfs: true,
+                    limit: $limit
+                }) YIELD path
                 RETURN path
-                ORDER BY length(path)
-                LIMIT 100
                 """
                 
-                result = await session.run(cypher, start_id=start_node_id)
+                result = await session.run(
+                    cypher,
+                    start_id=start_node_id,
+                    max_hops=min(max_hops, self.MAX_HOPS),
+                    rel_filter="|".join(relationship_types or []),
+                    limit=self.MAX_RELATED_PATHS
+                )
                 paths = []
                 
                 async for record in result:
@@ -146,30 +219,52 @@ class Neo4jClient:
         edge_props: Optional[Dict[str, Any]] = None
     ) -> str:
         """Create a triple (subject-predicate-object) in the graph"""
+        edge_ids = await self.create_triples([{
+            "subject_id": subject_id,
+            "subject_props": subject_props,
+            "predicate": predicate,
+            "object_id": object_id,
+            "object_props": object_props,
+            "edge_props": edge_props
+        }])
+        return edge_ids[0]
+    
+    async def create_triples(self, triples: List[Dict[str, Any]]) -> List[str]:
+        """Create many triples in a single write transaction
+        
+        Each triple is a dict with the same keys as create_triple's arguments.
+        """
+        rows = [
+            {
+                "subject_id": triple["subject_id"],
+                "subject_props": triple.get("subject_props") or {},
+                "predicate": triple["predicate"],
+                "object_id": triple["object_id"],
+                "object_props": triple.get("object_props") or {},
+                "edge_props": triple.get("edge_props") or {}
+            }
+            for triple in triples
+        ]
+        cypher = """
+        UNWIND $rows AS row
+        MERGE (s {id: row.subject_id})
+        ON CREATE SET s:Node
+        SET s += row.subject_props
+        MERGE (o {id: row.object_id})
+        ON CREATE SET o:Node
+        SET o += row.object_props
+        MERGE (s)-[r:RELATES {type: row.predicate}]->(o)
+        SET r += row.edge_props
+        RETURN elementId(r) as edge_id
+        """
+        
+        async def _write(tx):
+            result = await tx.run(cypher, rows=rows)
+            return [record['edge_id'] async for record in result]
+        
         try:
             async with self.session() as session:
-                cypher = """
-                MERGE (s {id: $subject_id})
-                SET s += $subject_props
-                MERGE (o {id: $object_id})
-                SET o += $object_props
-                MERGE (s)-[r:RELATES {type: $predicate}]->(o)
-                SET r += $edge_props
-                RETURN elementId(r) as edge_id
-                """
-                
-                result = await session.run(
-                    cypher,
-                    subject_id=subject_id,
-                    subject_props=subject_props,
-                    object_id=object_id,
-                    object_props=object_props,
-                    predicate=predicate,
-                    edge_props=edge_props or {}
-                )
-                
-                record = await result.single()
-                return record['edge_id']
+                return await session.execute_write(_write)
                 
         except Exception as e:
             logger.error(f"Triple creation failed: {e}")
@@ -186,28 +281,37 @@ class Neo4jClient:
             logger.error(f"Node count failed: {e}")
             return 0
     
+    @classmethod
+    def _escape_lucene(cls, text: str) -> str:
+        """Escape Lucene query syntax so user text is matched literally"""
+        escaped = cls.LUCENE_SPECIAL_CHARS.sub(r'\\\1', text)
+        # Lucene only treats the upper-case words as operators; the analyzer lowercases terms anyway
+        return cls.LUCENE_OPERATORS.sub(lambda match: match.group(1).lower(), escaped)
+    
     def _parse_path(self, neo4j_path) -> GraphPath:
         """Convert Neo4j path to GraphPath model"""
         nodes = []
         edges = []
         
         for node in neo4j_path.nodes:
+            props = dict(node)
             nodes.append(GraphNode(
-                id=node.get('id', str(node.id)),
-                type=list(node.labels)[0] if node.labels else 'Node',
-                name=node.get('name', ''),
-                properties=dict(node),
-                source=node.get('source', {})
+                id=props.get('id', str(node.id)),
+                type=next(iter(node.labels), 'Node'),
+                name=props.get('name', ''),
+                properties=props,
+                source=props.get('source', {})
             ))
         
         for rel in neo4j_path.relationships:
+            props = dict(rel)
             edges.append(GraphEdge(
                 id=str(rel.id),
                 from_node_id=str(rel.start_node.id),
                 to_node_id=str(rel.end_node.id),
                 relationship_type=rel.type,
-                properties=dict(rel),
-                weight=rel.get('weight', 1.0)
+                properties=props,
+                weight=props.get('weight', 1.0)
             ))
         
         return GraphPath(
@@ -2,16 +2,22 @@
 Redis client for SecureAsk caching operations
 """
 
-import json
+import hashlib
 import logging
 import os
 import asyncio
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple, Union
+import orjson
 import redis.asyncio as redis
+import zstandard as zstd
+from cachetools import TTLCache
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+# Format tag prepended to zstd-compressed cache values
+ZSTD_TAG = b"\x01"
+
 class RedisClient:
     """Async Redis client for caching with retry logic"""
     
@@ -20,6 +26,10 @@ class RedisClient:
         self.url = os.getenv("REDIS_URL", "redis://localhost:6379")
         self.max_retries = 3
         self.retry_delay = 1.0
+        # Per-process L1 in front of Redis for hot external API responses
+        self._l1 = TTLCache(maxsize=1024, ttl=60)
+        self._cctx = zstd.ZstdCompressor(level=3)
+        self._dctx = zstd.ZstdDecompressor()
     
     def with_retry(self, func):
         """Decorator for Redis operations with retry logic"""
@@ -48,7 +58,7 @@ class RedisClient:
         try:
             self.client = redis.from_url(
                 self.url,
-                decode_responses=True,
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
@@ -71,7 +81,7 @@ class RedisClient:
             await self.client.close()
             logger.info("Redis connection closed")
     
-    async def get(self, key: str) -> Optional[str]:
+    async def get(self, key: str) -> Optional[bytes]:
         """Get value by key with retry logic"""
         @self.with_retry
         async def _get():
@@ -82,7 +92,7 @@ class RedisClient:
     async def set(
         self,
         key: str,
-        value: str,
+        value: Union[str, bytes],
         ex: Optional[int] = None
     ) -> bool:
         """Set key-value pair with optional expiration and retry logic"""
@@ -116,6 +126,22 @@ class RedisClient:
             logger.error(f"Redis EXISTS failed: {e}")
             return False
     
+    @staticmethod
+    def _external_api_key(source: str, query: str) -> str:
+        """Build a process-stable cache key for an external API query"""
+        digest = hashlib.blake2b(query.strip().lower().encode('utf-8'), digest_size=16).hexdigest()
+        return f"external_api:{source}:{digest}"
+    
+    def _compress(self, data: Any) -> bytes:
+        """Serialize and zstd-compress a value for storage"""
+        return ZSTD_TAG + self._cctx.compress(orjson.dumps(data, default=str))
+    
+    def _decompress(self, value: bytes) -> Any:
+        """Decode a stored value, accepting legacy uncompressed JSON"""
+        if value[:1] == ZSTD_TAG:
+            return orjson.loads(self._dctx.decompress(value[1:]))
+        return orjson.loads(value)
+    
     async def cache_external_api_response(
         self,
         source: str,
@@ -127,10 +153,10 @@ class RedisClient:
         if not self.client:
             return False
         
-        cache_key = f"external_api:{source}:{abs(hash(query))}"
+        cache_key = self._external_api_key(source, query)
+        self._l1[cache_key] = data
         try:
-            serialized = json.dumps(data, default=str, separators=(',', ':'))
-            return await self.set(cache_key, serialized, ex=ttl)
+            return await self.set(cache_key, self._compress(data), ex=ttl)
         except Exception as e:
             logger.error(f"Failed to cache API response: {e}")
             return False
@@ -144,26 +170,70 @@ class RedisClient:
         if not self.client:
             return None
         
-        cache_key = f"external_api:{source}:{abs(hash(query))}"
+        cache_key = self._external_api_key(source, query)
+        data = self._l1.get(cache_key)
+        if data is not None:
+            return data
+        
         try:
             cached = await self.get(cache_key)
             if cached:
-                return json.loads(cached)
+                data = self._decompress(cached)
+                self._l1[cache_key] = data
+                return data
             return None
         except Exception as e:
             logger.error(f"Failed to get cached API response: {e}")
             return None
     
+    async def mget_cached(self, pairs: List[Tuple[str, str]]) -> List[Optional[Any]]:
+        """Get several cached external API responses in one round trip"""
+        if not self.client or not pairs:
+            return [None] * len(pairs)
+        
+        keys = [self._external_api_key(source, query) for source, query in pairs]
+        results = [self._l1.get(key) for key in keys]
+        misses = [i for i, data in enumerate(results) if data is None]
+        if not misses:
+            return results
+        
+        try:
+            values = await self.client.mget([keys[i] for i in misses])
+            for i, value in zip(misses, values):
+                if value:
+                    results[i] = self._l1[keys[i]] = self._decompress(value)
+            return results
+        except Exception as e:
+            logger.error(f"Failed to get cached API responses: {e}")
+            return results
+    
+    async def mset_cached(self, entries: List[Tuple[str, str, Any, int]]) -> bool:
+        """Cache several external API responses in one pipelined round trip"""
+        if not self.client or not entries:
+            return False
+        
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for source, query, data, ttl in entries:
+                    cache_key = self._external_api_key(source, query)
+                    self._l1[cache_key] = data
+                    pipe.set(cache_key, self._compress(data), ex=ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to cache API responses: {e}")
+            return False
+    
     async def cache_query_result(
         self,
         query_hash: str,
         result: Any,
         ttl: int = 1800  # 30 minutes
     ) -> bool:
-        """Cache GraphRAG query result"""
+        """Cache GraphRAG query result, storing already-serialized JSON as is"""
         cache_key = f"query_result:{query_hash}"
         try:
-            serialized = json.dumps(result, default=str, separators=(',', ':'))
+            serialized = result if isinstance(result, (bytes, str)) else orjson.dumps(result, default=str)
             return await self.set(cache_key, serialized, ex=ttl)
         except Exception as e:
             logger.error(f"Failed to cache query result: {e}")
@@ -175,7 +245,7 @@ class RedisClient:
         try:
             cached = await self.get(cache_key)
             if cached:
-                return json.loads(cached)
+                return orjson.loads(cached)
             return None
         except Exception as e:
             logger.error(f"Failed to get cached query result: {e}")
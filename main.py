@@ -8,13 +8,12 @@ import asyncio
 import logging
 import os
 import time
-import hashlib
 from contextlib import asynccontextmanager
 from typing import Dict, Any, List
 
 from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional
 import uvicorn
@@ -30,6 +29,7 @@ from middleware.auth import AuthMiddleware
 from middleware.rate_limit import RateLimitMiddleware, rate_limit_query, rate_limit_auth
 from connectors.sec_connector import SECConnector
 from connectors.reddit_connector import RedditConnector
+from connectors.tiktok_connector import TikTokConnector
 
 # Configure structured logging
 logger = setup_logging()
@@ -59,6 +59,9 @@ async def lifespan(app: FastAPI):
         # Initialize rate limiter
         rate_limiter = RateLimitMiddleware(redis_client)
         
+        # Pre-resolve DNS and pre-handshake TLS to the social media upstreams
+        await asyncio.gather(RedditConnector.warm_up(), TikTokConnector.warm_up())
+        
         # Initialize GraphRAG engine in background (non-blocking for health checks)
         graphrag_engine = GraphRAGEngine(neo4j_client, redis_client)
         # Skip initialization during startup for faster deployment
@@ -75,6 +78,8 @@ async def lifespan(app: FastAPI):
             await neo4j_client.close()
         if redis_client:
             await redis_client.close()
+        await RedditConnector.close()
+        await TikTokConnector.close()
         logger.info("🔌 SecureAsk API shutdown complete")
 
 # Create FastAPI app
@@ -142,6 +147,8 @@ async def health_check():
         health_status["dependencies"]["redis"] = "unhealthy"
         # Redis failure doesn't make service unhealthy, just disables caching
     
+    health_status["caches"] = {"reddit": RedditConnector.cache_stats()}
+    
     return health_status
 
 # Main query endpoint with rate limiting
@@ -171,9 +178,7 @@ async def create_query(
         await rate_limiter.check_rate_limit(http_request, "query", "30/minute")
         
         # Generate cache key for query
-        query_hash = hashlib.md5(
-            f"{request.question}:{sorted(request.sources)}:{request.max_hops}".encode()
-        ).hexdigest()
+        query_hash = GraphRAGEngine.query_hash(request.question, request.sources, request.max_hops)
         
         # Check cache first
         cached_result = None
@@ -199,14 +204,6 @@ async def create_query(
         
         processing_time = round((time.time() - start_time) * 1000, 2)
         
-        # Cache the result
-        if redis_client:
-            await redis_client.cache_query_result(
-                query_hash, 
-                result.model_dump(), 
-                ttl=1800  # 30 minutes
-            )
-        
         # Log query metrics
         log_query_processing(
             query=request.question,
@@ -234,6 +231,26 @@ async def create_query(
             detail=f"Query processing failed: {str(e)}"
         )
 
+# Streaming query endpoint with rate limiting
+@app.post("/api/v1/query/stream")
+@rate_limit_query("30/minute")
+async def stream_query(
+    request: QueryRequest,
+    http_request: Request,
+):
+    """Stream citations as NDJSON as each external source returns"""
+    await rate_limiter.check_rate_limit(http_request, "query", "30/minute")
+    return StreamingResponse(
+        graphrag_engine.process_query_stream(
+            question=request.question,
+            max_hops=request.max_hops,
+            sources=request.sources,
+            user_id="demo-user",  # Fixed for hackathon
+            include_answer=request.include_answer
+        ),
+        media_type="application/x-ndjson"
+    )
+
 # Get query status/results
 @app.get("/api/v1/query/{query_id}", response_model=QueryResponse)
 async def get_query(
@@ -307,6 +324,21 @@ async def search_graph(
             detail="Graph search failed"
         )
 
+# Streaming Reddit search endpoint
+@app.get("/api/v1/reddit/search")
+@rate_limit_query("30/minute")
+async def stream_reddit_search(
+    q: str,
+    http_request: Request,
+    user: dict = Depends(AuthMiddleware.verify_token)
+):
+    """Stream Reddit posts as NDJSON while the subreddit searches complete"""
+    await rate_limiter.check_rate_limit(http_request, "query", "30/minute")
+    return StreamingResponse(
+        RedditConnector.search_posts_stream(q),
+        media_type="application/x-ndjson"
+    )
+
 # Demo authentication endpoint with rate limiting
 @app.post("/api/v1/auth/demo")
 @rate_limit_auth("10/minute")